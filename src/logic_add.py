@@ -18,27 +18,80 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 
+import functools
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda function: function
+    prange = range
+
+# Extra examples run by doctest besides the docstrings of the
+# module (see the end of this file).
+__test__ = {}
+
 #----------------------------------------------------------
 class Observable:
     '''An observable (subject) base class for implementing
     the Observer Design Pattern (Gamma, et al. 1994).
     '''
 
+    __slots__ = ('_observers',)
+
     def __init__(self):
         '''Initialize an observable instance.
         '''
-        self.__observers = []
+        self._observers = []
+
+    def _set_observers(self, observers):
+        '''Replace the sequence of observers. Subclasses can
+        override this to share it with other objects.
+        '''
+        self._observers = observers
 
     def add_observer(self, observer):
         '''Add an observer to this observable object.
+
+        Observers can still be added after the object has
+        been frozen.
+        '''
+        observers = self._observers
+        if isinstance(observers, tuple):
+            self._set_observers(observers + (observer,))
+        else:
+            observers.append(observer)
+
+    def freeze(self):
+        '''Store the current observers in a tuple, which is
+        cheaper to iterate over in `notify_observers`.
+
+        Meant to be called once all the observers have been
+        registered.
+        '''
+        self._set_observers(tuple(self._observers))
+
+    def is_frozen(self):
+        '''Check if the observers have been frozen.
         '''
-        self.__observers.append(observer)
+        return isinstance(self._observers, tuple)
+
+    def get_observers(self):
+        '''Get the sequence of registered observers.
+        '''
+        return self._observers
 
     def notify_observers(self, *args):
         '''Notify all the observers by calling their
         `update` method.
         '''
-        for observer in self.__observers:
+        for observer in self._observers:
             observer.update(*args)
 
 #----------------------------------------------------------
@@ -57,29 +110,149 @@ class Wire(Observable):
     >>> wire.set(0)
     out1: 0
     out2: 0
+    >>> wire.set(0)
+    >>> wire.set(1)
+    out1: 1
+    out2: 1
     '''
 
+    __slots__ = ('_value', '_wires')
+
+    # True for wires whose value can never change.
+    _constant = False
+
+    def __init__(self):
+        '''Initialize a wire with no value set.
+
+        `_wires` is None until the wire gets connected to
+        other wires; from then on it's the tuple of all the
+        wires in the group, which share the same value and
+        the same sequence of observers.
+        '''
+        super().__init__()
+        self._value = None
+        self._wires = None
+
+    def _set_observers(self, observers):
+        '''Replace the sequence of observers of every wire
+        connected to this one.
+        '''
+        for wire in self._wires or (self,):
+            wire._observers = observers
+
+    def connect(self, other):
+        '''Connect the other wire to this one, so that from
+        now on both of them share their value and observers.
+
+        The observers of the other wire are kept. If only
+        one of the two wires has been set, the other one
+        takes its value and its observers are notified.
+        Connecting two wires with different values raises
+        ValueError.
+
+        >>> wire1 = Wire()
+        >>> wire2 = Wire()
+        >>> Display('wire1', wire1)
+        <...>
+        >>> Display('wire2', wire2)
+        <...>
+        >>> wire1.connect(wire2)
+        >>> wire2.set(1)
+        wire1: 1
+        wire2: 1
+        >>> wire1.value
+        1
+
+        >>> in1 = Wire()
+        >>> in2 = Wire()
+        >>> out = Wire()
+        >>> AndGate(in1, in2, out)
+        <...>
+        >>> in2.set(1)
+        >>> src = Wire()
+        >>> src.set(1)
+        >>> in1.connect(src)
+        >>> out.value
+        1
+
+        >>> a = Wire()
+        >>> b = Wire()
+        >>> a.set(0)
+        >>> b.set(1)
+        >>> a.connect(b)
+        Traceback (most recent call last):
+        ...
+        ValueError: connected wires have different values
+        >>> b.value
+        1
+        '''
+        if self._constant or other._constant:
+            raise TypeError('constant wires cannot be connected')
+        wires = self._wires or (self,)
+        if other in wires:
+            return
+        if self._value is None:
+            value = other._value
+            changed = () if value is None else self._observers
+        else:
+            value = self._value
+            if other._value is None:
+                changed = other._observers
+            elif other._value == value:
+                changed = ()
+            else:
+                raise ValueError(
+                    'connected wires have different values')
+        wires += other._wires or (other,)
+        if self.is_frozen():
+            observers = self._observers + tuple(other._observers)
+        else:
+            observers = self._observers + list(other._observers)
+        for wire in wires:
+            wire._wires = wires
+            wire._value = value
+            wire._observers = observers
+        for observer in changed:
+            observer.update()
+
     def set(self, value):
         '''Set the `value` property to 1 or 0 and notify
         all its observers.
+
+        Observers are not notified if the wire already had
+        the same value.
         '''
         assert value in [0, 1]
-        self.__value = value
+        if value == self._value:
+            return
+        if self._wires is None:
+            self._value = value
+        else:
+            for wire in self._wires:
+                wire._value = value
         self.notify_observers()
 
+    def store(self, value):
+        '''Set the `value` property to 1 or 0 without
+        notifying any observer.
+        '''
+        assert value in [0, 1]
+        if self._wires is None:
+            self._value = value
+        else:
+            for wire in self._wires:
+                wire._value = value
+
     def is_set(self):
         '''Check if the `value` property has been set.
         '''
-        try:
-            self.__value
-            return True
-        except AttributeError:
-            return False
+        return self._value is not None
 
     def get_value(self):
-        '''Get the `value` property.
+        '''Get the `value` property, which is None if it
+        hasn't been set.
         '''
-        return self.__value
+        return self._value
 
     value = property(get_value)
 
@@ -101,6 +274,8 @@ class Display:
     wire2: 1
     '''
 
+    __slots__ = ('_name', '_wire')
+
     def __init__(self, name, wire):
         '''Initialize a display object with a name and an
         input wire.
@@ -108,34 +283,54 @@ class Display:
         This display object will be registered as an
         observer of its input wire.
         '''
-        self.__name = name
-        self.__wire = wire
+        self._name = name
+        self._wire = wire
         wire.add_observer(self)
 
     def update(self):
         '''Called automatically when its input wire is
         set.
         '''
-        print('{0}: {1}'.format(self.__name,
-                                self.__wire.value))
+        print('{0}: {1}'.format(self._name,
+                                self._wire.value))
+
+#----------------------------------------------------------
+# List where every new gate is appended while build_circuit
+# is collecting gates, or None otherwise.
+_gate_collector = None
+
+def _set_gate_collector(gates):
+    '''Set the list where new gates are appended and return
+    the previous one.
+    '''
+    global _gate_collector
+    previous = _gate_collector
+    _gate_collector = gates
+    return previous
 
 #----------------------------------------------------------
 class DoubleInputGate:
     '''Base clase for a logic gate with two inputs.
     '''
 
-    def __init__(self, input1, input2, output):
+    __slots__ = ('_input1', '_input2', '_output', '_operation')
+
+    def __init__(self, input1, input2, output, operation):
         '''Initialize a gate with two input and one output
-        wires.
+        wires, and a function that computes the output bit
+        from the two input bits.
 
         This gate will be registered as an observer of the
         two input wires.
         '''
-        self.__input1 = input1
-        self.__input2 = input2
-        self.__output = output
+        self._input1 = input1
+        self._input2 = input2
+        self._output = output
+        self._operation = operation
         input1.add_observer(self)
         input2.add_observer(self)
+        if _gate_collector is not None:
+            _gate_collector.append(self)
 
     def update(self):
         '''Called automatically when one of the input
@@ -144,10 +339,181 @@ class DoubleInputGate:
         Sets the corresponding output wire to the expected
         result only when both input wires have been set.
         '''
-        if self.__input1.is_set() and self.__input2.is_set():
-            self.__output.set(
-                self.operation(self.__input1.value,
-                               self.__input2.value))
+        x = self._input1._value
+        y = self._input2._value
+        if x is not None and y is not None:
+            self._output.set(self._operation(x, y))
+
+    def compute(self):
+        '''Stores the result of the operation in the output
+        wire without notifying its observers.
+
+        Both input wires must have already been set.
+
+        >>> in1 = Wire()
+        >>> out = Wire()
+        >>> gate = AndGate(in1, Wire(), out)
+        >>> in1.store(1)
+        >>> gate.compute()
+        Traceback (most recent call last):
+        ...
+        TypeError: ...
+        '''
+        self._output.store(
+            self._operation(self._input1._value,
+                            self._input2._value))
+
+    def get_input1(self):
+        '''Get the `input1` property.
+        '''
+        return self._input1
+
+    input1 = property(get_input1)
+
+    def get_input2(self):
+        '''Get the `input2` property.
+        '''
+        return self._input2
+
+    input2 = property(get_input2)
+
+    def get_output(self):
+        '''Get the `output` property.
+        '''
+        return self._output
+
+    output = property(get_output)
+
+    def get_operation(self):
+        '''Get the `operation` property, the function that
+        computes the output bit from the two input bits.
+        '''
+        return self._operation
+
+    operation = property(get_operation)
+
+#----------------------------------------------------------
+def _add_class_tests(classes):
+    '''Register in `__test__` the examples in the docstrings
+    of the given classes and of their members.
+
+    doctest skips the classes imported from other modules,
+    so this is used to run the examples of the pure Python
+    core classes against the compiled ones.
+    '''
+    for cls in classes:
+        members = [('', cls)] + sorted(vars(cls).items())
+        for name, member in members:
+            doc = getattr(member, '__doc__', None)
+            if isinstance(doc, str) and '>>>' in doc:
+                key = '{0}.{1}'.format(cls.__name__, name)
+                __test__[key.rstrip('.')] = doc
+
+#----------------------------------------------------------
+# Use the compiled core classes when the optional logic_add_c
+# extension module has been built (see logic_add_c.pyx).
+_python_core_classes = (Observable, Wire, DoubleInputGate)
+try:
+    from logic_add_c import (Observable, Wire, DoubleInputGate,
+                             set_gate_collector as _set_gate_collector)
+except ImportError:
+    pass
+else:
+    _add_class_tests(_python_core_classes)
+
+#----------------------------------------------------------
+class ConstantWire(Wire):
+    '''Represents a wire whose value is fixed when it's
+    created.
+
+    Since its value never changes, observers are updated
+    as soon as they are added and then they are not kept.
+
+    >>> zero = ConstantWire(0)
+    >>> Display('Zero', zero)
+    Zero: 0
+    <...>
+
+    >>> in1 = Wire()
+    >>> out = Wire()
+    >>> AndGate(in1, ConstantWire(1), out)
+    <...>
+    >>> Display('Out', out)
+    <...>
+    >>> in1.set(1)
+    Out: 1
+
+    A gate can't change the value of a constant wire:
+
+    >>> in1 = Wire()
+    >>> in2 = Wire()
+    >>> OrGate(in1, in2, ConstantWire(0))
+    <...>
+    >>> in1.set(1)
+    >>> in2.set(0)
+    Traceback (most recent call last):
+    ...
+    AssertionError
+    '''
+
+    __slots__ = ()
+
+    _constant = True
+
+    def __init__(self, value):
+        '''Initialize a wire with the given constant value,
+        which should be 1 or 0.
+        '''
+        super().__init__()
+        super().store(value)
+
+    def add_observer(self, observer):
+        '''Update the observer right away without
+        registering it.
+        '''
+        observer.update()
+
+    def set(self, value):
+        '''Check that value is the same constant value of
+        this wire. Observers are never notified.
+        '''
+        assert value == self.value
+
+    def store(self, value):
+        '''Check that value is the same constant value of
+        this wire.
+
+        >>> one = ConstantWire(1)
+        >>> one.store(1)
+        >>> one.store(0)
+        Traceback (most recent call last):
+        ...
+        AssertionError
+        >>> one.value
+        1
+        '''
+        assert value == self.value
+
+    def connect(self, other):
+        '''Constant wires can't be connected to other wires,
+        in either direction, since that would let the other
+        wire change their value.
+
+        >>> wire = Wire()
+        >>> ConstantWire(0).connect(wire)
+        Traceback (most recent call last):
+        ...
+        TypeError: constant wires cannot be connected
+        >>> zero = ConstantWire(0)
+        >>> wire.connect(zero)
+        Traceback (most recent call last):
+        ...
+        TypeError: constant wires cannot be connected
+        >>> wire.set(1)
+        >>> zero.value
+        0
+        '''
+        raise TypeError('constant wires cannot be connected')
 
 #----------------------------------------------------------
 class AndGate(DoubleInputGate):
@@ -176,12 +542,13 @@ class AndGate(DoubleInputGate):
     Out: 0
     '''
 
-    def operation(self, x, y):
-        '''Returns x AND y.
+    __slots__ = ()
 
-        x and y should be 1 or 0.
+    def __init__(self, input1, input2, output):
+        '''Initialize an AND gate with two input and one
+        output wires.
         '''
-        return x & y
+        super().__init__(input1, input2, output, operator.and_)
 
 #----------------------------------------------------------
 class OrGate(DoubleInputGate):
@@ -210,12 +577,13 @@ class OrGate(DoubleInputGate):
     Out: 0
     '''
 
-    def operation(self, x, y):
-        '''Returns x OR y.
+    __slots__ = ()
 
-        x and y should be 1 or 0.
+    def __init__(self, input1, input2, output):
+        '''Initialize an OR gate with two input and one
+        output wires.
         '''
-        return x | y
+        super().__init__(input1, input2, output, operator.or_)
 
 #----------------------------------------------------------
 class XorGate(DoubleInputGate):
@@ -244,12 +612,13 @@ class XorGate(DoubleInputGate):
     Out: 0
     '''
 
-    def operation(self, x, y):
-        '''Returns x XOR y.
+    __slots__ = ()
 
-        x and y should be 1 or 0.
+    def __init__(self, input1, input2, output):
+        '''Initialize an XOR gate with two input and one
+        output wires.
         '''
-        return x ^ y
+        super().__init__(input1, input2, output, operator.xor)
 
 #----------------------------------------------------------
 class HalfAdder:
@@ -272,6 +641,8 @@ class HalfAdder:
     Carry: 1
     '''
 
+    __slots__ = ()
+
     def __init__(self, input1, input2, output, carry_out):
         '''Initialize a half adder with two input bits,
         the output bit of the addition and a carry.
@@ -303,6 +674,8 @@ class FullAdder:
     Carry: 1
     '''
 
+    __slots__ = ()
+
     def __init__(self, input1, input2, carry_in,
                  output, carry_out):
         '''Initialize a full adder with two inputs, an
@@ -316,6 +689,45 @@ class FullAdder:
         HalfAdder(carry_in, wire1, output, wire3)
         OrGate(wire3, wire2, carry_out)
 
+#----------------------------------------------------------
+class _WidthConstants(dict):
+    '''A dictionary that maps a number of bits to its
+    (mask, sign_bit) pair, computing each pair only the
+    first time it's requested.
+
+    Only widths up to `_MAX_CACHED_WIDTH` bits are stored,
+    so the dictionary stays small; wider pairs are computed
+    on every request.
+
+    >>> constants = _WidthConstants()
+    >>> constants[8]
+    (255, 128)
+    >>> constants[100] == (2 ** 100 - 1, 2 ** 99)
+    True
+    >>> list(constants)
+    [8]
+    '''
+
+    def __missing__(self, num_bits):
+        '''Compute and return the pair for num_bits,
+        storing it if num_bits is small enough.
+        '''
+        constants = (1 << num_bits) - 1, (1 << num_bits) >> 1
+        if num_bits <= _MAX_CACHED_WIDTH:
+            self[num_bits] = constants
+        return constants
+
+# Widest number of bits whose constants are kept in
+# _WIDTH_CONSTANTS.
+_MAX_CACHED_WIDTH = 64
+
+_WIDTH_CONSTANTS = _WidthConstants()
+
+#----------------------------------------------------------
+# Up to this many bits plain Python is faster than the
+# NumPy call overhead in to_binary and from_binary.
+_NUMPY_BITS_THRESHOLD = 32
+
 #----------------------------------------------------------
 def to_binary(n, num_bits):
     '''Create a list of num_bits binary digits equal to n.
@@ -336,12 +748,21 @@ def to_binary(n, num_bits):
 
     >>> to_binary(256, 9)
     [0, 0, 0, 0, 0, 0, 0, 0, 1]
+
+    >>> to_binary(-2, 4)
+    [0, 1, 1, 1]
+
+    >>> to_binary(2 ** 40 + 1, 41) == [1] + [0] * 39 + [1]
+    True
     '''
-    result = []
-    while len(result) < num_bits:
-        result.append(n & 1)
-        n >>= 1
-    return result
+    n &= _WIDTH_CONSTANTS[num_bits][0]
+    if np is None or num_bits <= _NUMPY_BITS_THRESHOLD:
+        return [(n >> i) & 1 for i in range(num_bits)]
+    bits = np.unpackbits(
+        np.frombuffer(n.to_bytes((num_bits + 7) // 8, 'little'),
+                      dtype=np.uint8),
+        bitorder='little')
+    return bits[:num_bits].tolist()
 
 #----------------------------------------------------------
 def from_binary(lst):
@@ -359,7 +780,15 @@ def from_binary(lst):
 
     >>> from_binary([])
     0
+
+    >>> from_binary([1] * 40)
+    1099511627775
     '''
+    if np is not None and len(lst) > _NUMPY_BITS_THRESHOLD:
+        return int.from_bytes(
+            np.packbits(np.asarray(lst, dtype=np.uint8),
+                        bitorder='little').tobytes(),
+            'little')
     result = 0
     for d in lst[::-1]:
         result <<= 1
@@ -367,37 +796,128 @@ def from_binary(lst):
     return result
 
 #----------------------------------------------------------
-def build_circuit(n):
+def build_circuit(n, gates=None):
     '''Builds the complete circuit for performing the
     addition of two integer numbers of size n bits each.
 
-    The funtion creates and wires together n full adders.
+    The funtion creates and wires together n adders. The
+    carry in of the least significant bits is always zero,
+    so those are added with a half adder instead of a full
+    adder, saving one half adder and an OR gate.
     It returns a three element tuple with the following:
     - A list of n wires for the first number to add.
     - A list of n wires for the second number to add.
     - A list of n wires for the result of the addition.
     The carry of the addition of the two most significant
     bits is always discarded.
+
+    If a gates list is given, every gate of the circuit is
+    appended to it in topological order (each gate comes
+    after the gates that drive its inputs), as required by
+    `simulate`.
+
+    >>> inputs1, inputs2, outputs = build_circuit(4)
+    >>> r = Converter(outputs)
+    >>> for wire, bit in zip(inputs1, to_binary(5, 4)):
+    ...     wire.set(bit)
+    >>> for wire, bit in zip(inputs2, to_binary(6, 4)):
+    ...     wire.set(bit)
+    >>> r.result
+    11
+
+    The circuit can be reused with new input values:
+
+    >>> for wire, bit in zip(inputs2, to_binary(1, 4)):
+    ...     wire.set(bit)
+    >>> r.result
+    6
     '''
     inputs1 = []
     inputs2 = []
     outputs = []
-    first_carry = Wire()
-    first_carry.set(0)
-    previous_carry = first_carry
-    for i in range(n):
-        inputs1.append(Wire())
-        inputs2.append(Wire())
-        outputs.append(Wire())
-        new_carry = Wire()
-        FullAdder(inputs1[i],
-                  inputs2[i],
-                  previous_carry,
-                  outputs[i],
-                  new_carry)
-        previous_carry = new_carry
+    previous_carry = None
+    # Gates are created bit by bit, from the least to the most
+    # significant, so creation order is already topological.
+    previous_collector = _set_gate_collector(gates)
+    try:
+        for i in range(n):
+            inputs1.append(Wire())
+            inputs2.append(Wire())
+            outputs.append(Wire())
+            new_carry = Wire()
+            if previous_carry is None:
+                HalfAdder(inputs1[i],
+                          inputs2[i],
+                          outputs[i],
+                          new_carry)
+            else:
+                FullAdder(inputs1[i],
+                          inputs2[i],
+                          previous_carry,
+                          outputs[i],
+                          new_carry)
+            previous_carry = new_carry
+    finally:
+        _set_gate_collector(previous_collector)
+    freeze_circuit(inputs1 + inputs2)
     return inputs1, inputs2, outputs
 
+#----------------------------------------------------------
+def simulate(gates, inputs1, inputs2, a, b):
+    '''Computes the values of all the wires of a circuit
+    for the inputs a and b by evaluating each gate once.
+
+    The gates list must be in topological order, like the
+    one filled by `build_circuit`. Instead of propagating
+    values through the observers of each wire, the input
+    bits are stored first and then every gate is computed
+    in order. No observer is notified, so the result must
+    be read directly from the output wires.
+
+    >>> gates = []
+    >>> inputs1, inputs2, outputs = build_circuit(4, gates)
+    >>> len(gates)
+    17
+    >>> simulate(gates, inputs1, inputs2, 5, 6)
+    >>> from_binary([wire.value for wire in outputs])
+    11
+    >>> simulate(gates, inputs1, inputs2, 7, 15)
+    >>> from_binary([wire.value for wire in outputs])
+    6
+    '''
+    num_bits = len(inputs1)
+    for wire, bit in zip(inputs1, to_binary(a, num_bits)):
+        wire.store(bit)
+    for wire, bit in zip(inputs2, to_binary(b, num_bits)):
+        wire.store(bit)
+    for gate in gates:
+        gate.compute()
+
+#----------------------------------------------------------
+def freeze_circuit(wires):
+    '''Freeze the specified wires and every wire reachable
+    from them through the outputs of the gates observing
+    them.
+
+    >>> in1 = Wire()
+    >>> in2 = Wire()
+    >>> out = Wire()
+    >>> AndGate(in1, in2, out)
+    <...>
+    >>> freeze_circuit([in1, in2])
+    >>> in1.is_frozen(), out.is_frozen()
+    (True, True)
+    '''
+    pending = list(wires)
+    while pending:
+        wire = pending.pop()
+        if wire.is_frozen():
+            continue
+        wire.freeze()
+        for observer in wire.get_observers():
+            if isinstance(observer, DoubleInputGate):
+                pending.append(observer.output)
+
 #----------------------------------------------------------
 class Converter:
     '''A class for converting a series of bits represented
@@ -414,43 +934,87 @@ class Converter:
     >>> wires[2].set(1)
     >>> r.result
     4
+
+    >>> wires = [Wire(), Wire(), Wire()]
+    >>> r = Converter(wires)
+    >>> wires[0].set(1)
+    >>> wires[0].set(1)
+    >>> wires[1].set(1)
+    >>> wires[2].set(0)
+    >>> r.result
+    3
+
+    Wires that were already set when the converter was
+    created are taken into account:
+
+    >>> wires = [Wire(), Wire()]
+    >>> wires[0].set(1)
+    >>> r = Converter(wires)
+    >>> wires[1].set(0)
+    >>> r.result
+    1
+    >>> Converter(wires).result
+    1
     '''
 
+    __slots__ = ('_outputs', '_pending', '_result', '_sign')
+
     def __init__(self, outputs):
         '''Initialize a converter object with the specified
         list of output wires.
 
         This converter will be registered as an observer of
-        each wire in the outputs list.
+        each wire in the outputs list. If all of them are
+        already set, the `result` property is set right away.
         '''
-        self.__outputs = outputs
+        self._outputs = outputs
+        self._pending = sum(not output.is_set()
+                            for output in outputs)
         for output in outputs:
             output.add_observer(self)
+        if self._pending == 0:
+            self._convert()
 
     def update(self):
         '''Called automatically when any of its wires is
         set.
 
         Sets the `result` property when all the wires have
-        been set.
+        been set. Instead of checking every wire on each
+        call, the number of pending updates is counted down;
+        the wires are only checked when one update is left,
+        in case some wire was set more than once.
+        '''
+        if self._pending > 1:
+            self._pending -= 1
+            return
+        if self._pending == 1:
+            if not all(output.is_set()
+                       for output in self._outputs):
+                return
+            self._pending = 0
+        self._convert()
+
+    def _convert(self):
+        '''Set the `result` and `sign` properties from the
+        values of the wires, which must all be set.
         '''
-        if all([output.is_set() for output in self.__outputs]):
-            binary_list = [output.value
-                            for output in self.__outputs]
-            self.__result = from_binary(binary_list)
-            self.__sign = binary_list[-1]
+        binary_list = list(map(operator.attrgetter('value'),
+                               self._outputs))
+        self._result = from_binary(binary_list)
+        self._sign = binary_list[-1]
 
     def get_result(self):
         '''Get the `result` property.
         '''
-        return self.__result
+        return self._result
 
     result = property(get_result)
 
     def get_sign(self):
         '''Get the `sign` property.
         '''
-        return self.__sign
+        return self._sign
 
     sign = property(get_sign)
 
@@ -459,8 +1023,11 @@ def add(a, b, num_bits=32):
     '''Computes the addition of a plus b using the
     specified number of bits.
 
-    Builds a circuit made of num_bits full adders to
-    perform the binary addition of the two input numbers.
+    The result is exactly what the circuit returned by
+    `build_circuit(num_bits)` produces: a ripple-carry
+    adder computes the sum modulo 2 ** num_bits. Instead of
+    simulating every gate, the whole circuit is evaluated
+    at once as a single word-wide addition.
     Values are assumed to be in two's complement, that
     means that the most significant bit is considered the
     sign bit.
@@ -484,18 +1051,242 @@ def add(a, b, num_bits=32):
     >>> add(add(add(add(add(4, 8), 15), 16), 23), 42)
     108
     '''
-    inputs1, inputs2, outputs = build_circuit(num_bits)
-    r = Converter(outputs)
-    for input1, input2, dig1, dig2 in zip(inputs1,
-                                          inputs2,
-                                          to_binary(a, num_bits),
-                                          to_binary(b, num_bits)):
-        input1.set(dig1)
-        input2.set(dig2)
-    if r.sign == 1:
-        return -(2 ** num_bits - r.result)
-    else:
-        return r.result
+    mask, sign_bit = _WIDTH_CONSTANTS[num_bits]
+    r = ((a & mask) + (b & mask)) & mask
+    # Twice the sign bit equals 2 ** num_bits, so this turns
+    # the unsigned result into two's complement.
+    return r - ((r & sign_bit) << 1)
+
+#----------------------------------------------------------
+# Python operator emitted by _compile_adder for each gate
+# operation.
+_GATE_OPERATORS = {operator.and_: '&',
+                   operator.or_: '|',
+                   operator.xor: '^'}
+
+@functools.lru_cache(maxsize=16)
+def _compile_adder(num_bits):
+    '''Generates, compiles and returns a function that
+    evaluates the circuit built by `build_circuit(num_bits)`.
+
+    The generated function takes two non-negative integers
+    and returns the unsigned sum. It contains one line of
+    straight-line code per gate, in topological order, so
+    no wire or gate objects are involved when it is called.
+    '''
+    gates = []
+    inputs1, inputs2, outputs = build_circuit(num_bits, gates)
+    names = {}
+    lines = ['def adder(a, b):']
+    for prefix, inputs in (('a', inputs1), ('b', inputs2)):
+        for i, wire in enumerate(inputs):
+            names[wire] = '{0}{1}'.format(prefix, i)
+            lines.append('    {0}{1} = ({0} >> {1}) & 1'.format(
+                prefix, i))
+    for gate in gates:
+        names[gate.output] = 'w{0}'.format(len(names))
+        lines.append('    {0} = {1} {2} {3}'.format(
+            names[gate.output],
+            names[gate.input1],
+            _GATE_OPERATORS[gate.operation],
+            names[gate.input2]))
+    lines.append('    return ' + ' | '.join(
+        '({0} << {1})'.format(names[wire], i)
+        for i, wire in enumerate(outputs)))
+    namespace = {}
+    exec(compile('\n'.join(lines),
+                 '<adder{0}>'.format(num_bits),
+                 'exec'),
+         namespace)
+    return namespace['adder']
+
+#----------------------------------------------------------
+def add_compiled(a, b, num_bits=32):
+    '''Computes the addition of a plus b by evaluating
+    every gate of the circuit made of num_bits adders.
+
+    The circuit is translated once per number of bits into
+    a Python function with one statement per gate, which is
+    then reused by later calls. Results follow the same
+    two's complement rules as `add`.
+
+    >>> add_compiled(1, 2)
+    3
+    >>> add_compiled(127, 128, 8)
+    -1
+    >>> add_compiled(-1000, -1)
+    -1001
+    >>> add_compiled(1, 1, 2)
+    -2
+    '''
+    mask, sign_bit = _WIDTH_CONSTANTS[num_bits]
+    r = _compile_adder(num_bits)(a & mask, b & mask)
+    return r - ((r & sign_bit) << 1)
+
+#----------------------------------------------------------
+def add_batch(a_arr, b_arr, num_bits=32):
+    '''Computes the element-wise addition of two arrays of
+    integers using the specified number of bits.
+
+    This is the fast path for adding many pairs at once
+    (for example, when fuzz testing the adder): all sums
+    are computed with a single vectorized NumPy operation.
+    Results follow the same two's complement rules as
+    `add`. Requires NumPy and at most 64 bits; its examples
+    are in `__test__`, so they only run when NumPy is
+    installed.
+    '''
+    if np is None:
+        raise ImportError('add_batch requires NumPy')
+    a = np.asarray(a_arr, dtype=np.int64).view(np.uint64)
+    b = np.asarray(b_arr, dtype=np.int64).view(np.uint64)
+    shift = np.uint64(64 - num_bits)
+    r = (a + b) << shift
+    return r.view(np.int64) >> np.int64(shift)
+
+#----------------------------------------------------------
+@njit(['int64(int64, int64, int64)',
+       'int64(int32, int32, int32)'],
+      cache=True, boundscheck=False)
+def add_ripple_numba(a, b, num_bits):
+    '''Computes the addition of a plus b by rippling the
+    carry through num_bits full adders, one bit at a time.
+
+    Unlike `add`, every full adder of the circuit is
+    evaluated, but with plain bit operations instead of
+    wire and gate objects. When Numba is available the
+    function is compiled to machine code when the module is
+    imported, for 64 and 32 bit integer arguments; the
+    compiled code is cached on disk so later imports can
+    reuse it. Otherwise it runs as regular Python. At most
+    64 bits are supported.
+
+    >>> add_ripple_numba(1, 2, 32)
+    3
+    >>> add_ripple_numba(127, 128, 8)
+    -1
+    >>> add_ripple_numba(-1000, -1, 32)
+    -1001
+    >>> add_ripple_numba(1, 1, 2)
+    -2
+    '''
+    carry = 0
+    result = 0
+    for i in range(num_bits):
+        x = (a >> i) & 1
+        y = (b >> i) & 1
+        partial = x ^ y
+        result |= (partial ^ carry) << i
+        carry = (x & y) | (carry & partial)
+    # Subtracting twice the sign bit turns the unsigned result
+    # into two's complement; for 64 bits the doubled sign bit
+    # wraps to zero under Numba, where result already is signed.
+    return result - ((result & (1 << (num_bits - 1))) << 1)
+
+#----------------------------------------------------------
+# No explicit signature here: compiling the parallel kernel
+# is slow, so it's left for the first call to
+# add_ripple_numba_batch instead of every import of this
+# module. That function always passes int64 arrays, so only
+# one version gets compiled.
+@njit(parallel=True, cache=True, boundscheck=False)
+def _add_ripple_numba_batch(a, b, num_bits):
+    '''Applies `add_ripple_numba` to every pair of elements
+    of the a and b arrays, spreading the work across all
+    available cores.
+    '''
+    out = np.empty(a.shape[0], dtype=np.int64)
+    for i in prange(a.shape[0]):
+        out[i] = add_ripple_numba(a[i], b[i], num_bits)
+    return out
+
+def add_ripple_numba_batch(a_arr, b_arr, num_bits=32):
+    '''Computes the element-wise addition of two arrays of
+    integers using `add_ripple_numba`. Requires NumPy; its
+    examples are in `__test__`.
+    '''
+    if np is None:
+        raise ImportError('add_ripple_numba_batch requires NumPy')
+    a = np.ascontiguousarray(a_arr, dtype=np.int64)
+    b = np.ascontiguousarray(b_arr, dtype=np.int64)
+    return _add_ripple_numba_batch(a, b, num_bits)
+
+#----------------------------------------------------------
+def add_bitsliced(a_slices, b_slices, num_bits=32):
+    '''Computes many additions at once by rippling the carry
+    through num_bits full adders, where every bit operation
+    evaluates the same adder for all the pairs of numbers.
+
+    The inputs are bit slices: a_slices[j] is an integer
+    whose k-th bit is the j-th bit of the k-th number to
+    add. Returns the list of num_bits slices of the sums,
+    in the same layout. Any number of pairs can be packed
+    into a slice; a slice can also be a NumPy array of
+    unsigned integers, each one holding its own group of
+    pairs.
+
+    Adding 1 + 2 and 3 + 1 with 2 bits gives 3 and 0:
+
+    >>> add_bitsliced([0b11, 0b10], [0b10, 0b01], 2)
+    [1, 1]
+
+    Four 8-bit additions, where the carry of 255 + 1 and of
+    127 + 1 ripples through several bits:
+
+    >>> def to_slices(numbers, num_bits):
+    ...     return [from_binary(bits) for bits in
+    ...             zip(*(to_binary(n, num_bits) for n in numbers))]
+    >>> def from_slices(slices, count):
+    ...     return [from_binary(bits) for bits in
+    ...             zip(*(to_binary(s, count) for s in slices))]
+    >>> sums = add_bitsliced(to_slices([255, 127, 15, 200], 8),
+    ...                      to_slices([1, 1, 1, 100], 8), 8)
+    >>> from_slices(sums, 4)
+    [0, 128, 16, 44]
+    '''
+    carry = 0
+    result = []
+    for j in range(num_bits):
+        x = a_slices[j]
+        y = b_slices[j]
+        partial = x ^ y
+        result.append(partial ^ carry)
+        carry = (x & y) | (carry & partial)
+    return result
+
+#----------------------------------------------------------
+# Examples that need NumPy are only run as tests when it's
+# installed, since NumPy is optional.
+if np is not None:
+    __test__['add_batch'] = '''
+    >>> add_batch([1, 255, 127, -42], [2, 1, 128, 42], 8).tolist()
+    [3, 0, -1, 0]
+    >>> add_batch([-1000, 1], [-1, -1000]).tolist()
+    [-1001, -999]
+    >>> add_batch([2 ** 63 - 1], [1], 64).tolist()
+    [-9223372036854775808]
+    '''
+    __test__['add_ripple_numba_batch'] = '''
+    >>> add_ripple_numba_batch([1, 255, 127], [2, 1, 128], 8).tolist()
+    [3, 0, -1]
+    '''
+    __test__['add_bitsliced'] = '''
+    Each element of the NumPy slices holds its own group of
+    pairs; here the first group adds 255 + 1 and 127 + 1,
+    and the second one 15 + 1 and 200 + 100:
+
+    >>> def to_slices(numbers):
+    ...     return [from_binary(bits) for bits in
+    ...             zip(*(to_binary(n, 8) for n in numbers))]
+    >>> a_slices = np.array([to_slices([255, 127]), to_slices([15, 200])],
+    ...                     dtype=np.uint64).T
+    >>> b_slices = np.array([to_slices([1, 1]), to_slices([1, 100])],
+    ...                     dtype=np.uint64).T
+    >>> sums = add_bitsliced(a_slices, b_slices, 8)
+    >>> [from_binary([(int(s[g]) >> k) & 1 for s in sums])
+    ...  for g in range(2) for k in range(2)]
+    [0, 128, 16, 44]
+    '''
 
 #----------------------------------------------------------
 # Run unit tests if this file isn't loaded as a module.
@@ -0,0 +1,360 @@
+#
+# Compiled versions of the core classes of logic_add.
+#
+# Copyright (C) 2018 Ariel Ortiz
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+# cython: language_level=3
+#
+# Build in place with:
+#
+#     $ cythonize -i logic_add_c.pyx
+#
+# When the resulting extension module is importable, logic_add
+# uses these classes instead of its pure Python versions.
+#
+
+import operator
+
+#----------------------------------------------------------
+# Kinds of operations that DoubleInputGate computes without
+# calling back into Python.
+cdef enum:
+    OP_AND
+    OP_OR
+    OP_XOR
+    OP_OTHER
+
+#----------------------------------------------------------
+# List where every new gate is appended while build_circuit
+# is collecting gates, or None otherwise.
+cdef object _gate_collector = None
+
+def set_gate_collector(gates):
+    '''Set the list where new gates are appended and return
+    the previous one.
+    '''
+    global _gate_collector
+    previous = _gate_collector
+    _gate_collector = gates
+    return previous
+
+#----------------------------------------------------------
+cdef class DoubleInputGate
+
+#----------------------------------------------------------
+cdef class Observable:
+    '''An observable (subject) base class for implementing
+    the Observer Design Pattern (Gamma, et al. 1994).
+    '''
+
+    cdef public object _observers
+
+    def __init__(self):
+        '''Initialize an observable instance.
+        '''
+        self._observers = []
+
+    def _set_observers(self, observers):
+        '''Replace the sequence of observers. Subclasses can
+        override this to share it with other objects.
+        '''
+        self._observers = observers
+
+    def add_observer(self, observer):
+        '''Add an observer to this observable object.
+
+        Observers can still be added after the object has
+        been frozen.
+        '''
+        observers = self._observers
+        if isinstance(observers, tuple):
+            self._set_observers(observers + (observer,))
+        else:
+            observers.append(observer)
+
+    def freeze(self):
+        '''Store the current observers in a tuple, which is
+        cheaper to iterate over in `notify_observers`.
+        '''
+        self._set_observers(tuple(self._observers))
+
+    def is_frozen(self):
+        '''Check if the observers have been frozen.
+        '''
+        return isinstance(self._observers, tuple)
+
+    def get_observers(self):
+        '''Get the sequence of registered observers.
+        '''
+        return self._observers
+
+    def notify_observers(self, *args):
+        '''Notify all the observers by calling their
+        `update` method.
+        '''
+        if args:
+            for observer in self._observers:
+                observer.update(*args)
+        else:
+            self._notify()
+
+    cdef int _notify(self) except -1:
+        '''Notify all the observers, calling gates directly
+        through their C level update.
+        '''
+        return _notify(self._observers)
+
+#----------------------------------------------------------
+cdef int _notify(observers) except -1:
+    for observer in observers:
+        if isinstance(observer, DoubleInputGate):
+            (<DoubleInputGate>observer)._update()
+        else:
+            observer.update()
+    return 0
+
+#----------------------------------------------------------
+cdef class Wire(Observable):
+    '''Represents wire objects to connect components.
+
+    The value is kept as a C char, where -1 means that it
+    hasn't been set.
+    '''
+
+    cdef signed char _bit
+    cdef tuple _wires
+
+    # True for wires whose value can never change.
+    _constant = False
+
+    def __init__(self):
+        '''Initialize a wire with no value set.
+
+        `_wires` is None until the wire gets connected to
+        other wires; from then on it's the tuple of all the
+        wires in the group, which share the same value and
+        the same sequence of observers.
+        '''
+        Observable.__init__(self)
+        self._bit = -1
+        self._wires = None
+
+    def _set_observers(self, observers):
+        '''Replace the sequence of observers of every wire
+        connected to this one.
+        '''
+        cdef Wire wire
+        for wire in self._wires or (self,):
+            wire._observers = observers
+
+    def connect(self, Wire other):
+        '''Connect the other wire to this one, so that from
+        now on both of them share their value and observers.
+
+        If only one of the two wires has been set, the other
+        one takes its value and its observers are notified.
+        Connecting two wires with different values raises
+        ValueError.
+        '''
+        cdef Wire wire
+        cdef signed char bit
+        if self._constant or other._constant:
+            raise TypeError('constant wires cannot be connected')
+        cdef tuple wires = self._wires or (self,)
+        if other in wires:
+            return
+        if self._bit < 0:
+            bit = other._bit
+            changed = () if bit < 0 else self._observers
+        else:
+            bit = self._bit
+            if other._bit < 0:
+                changed = other._observers
+            elif other._bit == bit:
+                changed = ()
+            else:
+                raise ValueError(
+                    'connected wires have different values')
+        wires += other._wires or (other,)
+        if self.is_frozen():
+            observers = self._observers + tuple(other._observers)
+        else:
+            observers = self._observers + list(other._observers)
+        for wire in wires:
+            wire._wires = wires
+            wire._bit = bit
+            wire._observers = observers
+        _notify(changed)
+
+    def set(self, value):
+        '''Set the `value` property to 1 or 0 and notify
+        all its observers.
+
+        Observers are not notified if the wire already had
+        the same value.
+        '''
+        assert value in [0, 1]
+        self._set(value)
+
+    cdef int _set(self, signed char value) except -1:
+        if value == self._bit:
+            return 0
+        self._store(value)
+        return self._notify()
+
+    cdef void _store(self, signed char value):
+        cdef Wire wire
+        if self._wires is None:
+            self._bit = value
+        else:
+            for wire in self._wires:
+                wire._bit = value
+
+    def store(self, value):
+        '''Set the `value` property to 1 or 0 without
+        notifying any observer.
+        '''
+        assert value in [0, 1]
+        self._store(value)
+
+    def is_set(self):
+        '''Check if the `value` property has been set.
+        '''
+        return self._bit >= 0
+
+    def get_value(self):
+        '''Get the `value` property, which is None if it
+        hasn't been set.
+        '''
+        return None if self._bit < 0 else self._bit
+
+    value = property(get_value)
+
+#----------------------------------------------------------
+cdef class DoubleInputGate:
+    '''Base clase for a logic gate with two inputs.
+    '''
+
+    cdef public Wire _input1
+    cdef public Wire _input2
+    cdef public Wire _output
+    cdef public object _operation
+    cdef int _kind
+    cdef bint _plain_output
+
+    def __init__(self, input1, input2, output, operation):
+        '''Initialize a gate with two input and one output
+        wires, and a function that computes the output bit
+        from the two input bits.
+
+        This gate will be registered as an observer of the
+        two input wires.
+        '''
+        self._input1 = input1
+        self._input2 = input2
+        self._output = output
+        self._operation = operation
+        # Subclasses of Wire defined in Python, like
+        # ConstantWire, may override set and store, so the C
+        # level methods are only used for plain wires.
+        self._plain_output = type(output) is Wire
+        if operation is operator.and_:
+            self._kind = OP_AND
+        elif operation is operator.or_:
+            self._kind = OP_OR
+        elif operation is operator.xor:
+            self._kind = OP_XOR
+        else:
+            self._kind = OP_OTHER
+        input1.add_observer(self)
+        input2.add_observer(self)
+        if _gate_collector is not None:
+            _gate_collector.append(self)
+
+    cdef signed char _apply(self, signed char x,
+                            signed char y) except -1:
+        if self._kind == OP_AND:
+            return x & y
+        if self._kind == OP_OR:
+            return x | y
+        if self._kind == OP_XOR:
+            return x ^ y
+        return self._operation(x, y)
+
+    def update(self):
+        '''Called automatically when one of the input
+        wires is set.
+
+        Sets the corresponding output wire to the expected
+        result only when both input wires have been set.
+        '''
+        self._update()
+
+    cdef int _update(self) except -1:
+        cdef signed char x = self._input1._bit
+        cdef signed char y = self._input2._bit
+        if x >= 0 and y >= 0:
+            if self._plain_output:
+                self._output._set(self._apply(x, y))
+            else:
+                self._output.set(self._apply(x, y))
+        return 0
+
+    def compute(self):
+        '''Stores the result of the operation in the output
+        wire without notifying its observers.
+
+        Both input wires must have already been set;
+        otherwise TypeError is raised, as in the pure Python
+        version.
+        '''
+        cdef signed char x = self._input1._bit
+        cdef signed char y = self._input2._bit
+        if x < 0 or y < 0:
+            raise TypeError('both input wires must be set')
+        if self._plain_output:
+            self._output._store(self._apply(x, y))
+        else:
+            self._output.store(self._apply(x, y))
+
+    def get_input1(self):
+        '''Get the `input1` property.
+        '''
+        return self._input1
+
+    input1 = property(get_input1)
+
+    def get_input2(self):
+        '''Get the `input2` property.
+        '''
+        return self._input2
+
+    input2 = property(get_input2)
+
+    def get_output(self):
+        '''Get the `output` property.
+        '''
+        return self._output
+
+    output = property(get_output)
+
+    def get_operation(self):
+        '''Get the `operation` property, the function that
+        computes the output bit from the two input bits.
+        '''
+        return self._operation
+
+    operation = property(get_operation)